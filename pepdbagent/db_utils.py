@@ -9,6 +9,7 @@ from sqlalchemy import (
     Enum,
     FetchedValue,
     ForeignKey,
+    Index,
     Result,
     Select,
     String,
@@ -275,6 +276,11 @@ class HistoryProjects(Base):
         back_populates="history_project_mapping", cascade="all, delete-orphan"
     )
 
+    # project history is always fetched by project and ordered by update time
+    __table_args__ = (
+        Index("ix_project_history_project_id_update_time", "project_id", update_time.desc()),
+    )
+
 
 class UpdateTypes(enum.Enum):
     """
@@ -303,12 +303,12 @@ class PEPDatabaseNamespace:
             projects_created=counts_submission,
         )
 
-    def upload_tar_info(self, tar_info: TarNamespaceModel) -> None:
+    def upload_tar_info(self, tar_info: TarNamespaceModel) -> TarNamespaceModel:
         """
         Upload metadata of tar GEO files
 
         tar_info: TarNamespaceModel
-        :return: None
+        :return: uploaded tar info (with identifier and creation date set by the database)
         """
 
         with Session(self._sa_engine) as session:
@@ -320,10 +320,22 @@ class PEPDatabaseNamespace:
                 file_size=tar_info.file_size,
             )
             session.add(new_tar)
+            # id is returned by the INSERT itself, no need to read the row back
+            session.flush()
+            uploaded_tar = TarNamespaceModel(
+                identifier=new_tar.id,
+                namespace=new_tar.namespace,
+                file_path=new_tar.file_path,
+                creation_date=new_tar.creation_date,
+                number_of_projects=new_tar.number_of_projects,
+                file_size=new_tar.file_size,
+            )
             session.commit()
 
             _LOGGER.info("Geo tar info was uploaded successfully!")
 
+        return uploaded_tar
+
     def get_tar_info(self, namespace: str) -> TarNamespaceModelReturn:
         """
         Get metadata of tar GEO files
@@ -564,7 +564,7 @@ class PEPDatabaseProject:
 
         :param update_dict: dict with update key->values. Dict structure:
             {
-                    project: Optional[peppy.Project]
+                    project: Optional[Union[peppy.Project, dict]]
                     is_private: Optional[bool]
                     tag: Optional[str]
                     name: Optional[str]
@@ -576,110 +576,185 @@ class PEPDatabaseProject:
                     subsamples: Optional[List[List[dict]]]
                     pop: Optional[bool]
             }
+            Samples can be updated without config and without building peppy.Project:
+            {"samples": prj["_sample_dict"]}
+            Existing samples have to include pephub_sample_id, new samples may omit it
+            (at least one sample in the list has to have it, otherwise use overwrite method)
         :param namespace: project namespace
         :param name: project name
         :param tag: project tag
         :param user: user that updates the project if user is not provided, user will be set as Namespace
         :return: None
         """
-        if self.exists(namespace=namespace, name=name, tag=tag):
-            if isinstance(update_dict, UpdateItems):
-                update_values = update_dict
-            else:
-                if "project" in update_dict:
-                    project_dict = update_dict.pop("project").to_dict(
-                        extended=True, orient="records"
-                    )
-                    update_dict["config"] = project_dict[CONFIG_KEY]
-                    update_dict["samples"] = project_dict[SAMPLE_RAW_DICT_KEY]
-                    update_dict["subsamples"] = project_dict[SUBSAMPLE_RAW_LIST_KEY]
+        statement = self._create_select_statement(name, namespace, tag)
 
-                update_values = UpdateItems(**update_dict)
+        with Session(self._sa_engine) as session:
+            found_prj: Projects = session.scalar(statement)
 
-            update_values = self.__create_update_dict(update_values)
+            if not found_prj:
+                raise ProjectNotFoundError(
+                    f"Pep {namespace}/{name}:{tag} was not found. No items will be updated!"
+                )
 
-            statement = self._create_select_statement(name, namespace, tag)
+            self._update(session, found_prj, update_dict, user=user or namespace)
 
-            with Session(self._sa_engine) as session:
-                found_prj: Projects = session.scalar(statement)
+            session.commit()
 
-                if not found_prj:
-                    raise ProjectNotFoundError(
-                        f"Pep {namespace}/{name}:{tag} was not found. No items will be updated!"
+        return None
+
+    def update_many(
+        self,
+        updates: List[Union[dict, UpdateItems]],
+        namespace: str,
+        name: str,
+        tag: str = DEFAULT_TAG,
+        user: str = None,
+    ) -> None:
+        """
+        Apply several updates to the project in one transaction.
+        Updates are applied in the given order, and each of them is recorded in project history
+        (the same way as in update method). If one of the updates fails, nothing is updated.
+
+        :param updates: list of update dicts. Structure of each dict is the same as in update method
+        :param namespace: project namespace
+        :param name: project name
+        :param tag: project tag
+        :param user: user that updates the project if user is not provided, user will be set as Namespace
+        :return: None
+        """
+        statement = self._create_select_statement(name, namespace, tag)
+
+        with Session(self._sa_engine) as session:
+            found_prj: Projects = session.scalar(statement)
+
+            if not found_prj:
+                raise ProjectNotFoundError(
+                    f"Pep {namespace}/{name}:{tag} was not found. No items will be updated!"
+                )
+
+            for update_dict in updates:
+                self._update(session, found_prj, update_dict, user=user or namespace)
+                # next update has to see the state of the project after the previous one
+                session.flush()
+                session.expire_all()
+
+            session.commit()
+
+        return None
+
+    def _update(
+        self,
+        session: Session,
+        found_prj: Projects,
+        update_dict: Union[dict, UpdateItems],
+        user: str,
+    ) -> None:
+        """
+        Apply update to the project in the open session. Session is not committed.
+
+        :param session: open session object
+        :param found_prj: project to be updated
+        :param update_dict: dict with update key->values (see update method)
+        :param user: user that updates the project
+        :return: None
+        """
+        if isinstance(update_dict, UpdateItems):
+            update_values = update_dict
+        else:
+            if "project" in update_dict:
+                project = update_dict.pop("project")
+                if isinstance(project, peppy.Project):
+                    project_dict = project.to_dict(extended=True, orient="records")
+                elif isinstance(project, dict):
+                    # raw project dict is used as is, without building peppy.Project
+                    _LOGGER.warning(
+                        f"Project {found_prj.namespace}/{found_prj.name}:{found_prj.tag} is provided "
+                        f"as dictionary. Project won't be validated."
+                    )
+                    project_dict = ProjectDict(**project).model_dump(by_alias=True)
+                else:
+                    raise PEPDatabaseAgentError(
+                        "Project has to be peppy.Project object or dictionary with PEP elements"
                     )
+                update_dict["config"] = project_dict[CONFIG_KEY]
+                update_dict["samples"] = project_dict[SAMPLE_RAW_DICT_KEY]
+                update_dict["subsamples"] = project_dict[SUBSAMPLE_RAW_LIST_KEY]
 
-                self._convert_update_schema_id(session, update_values)
-
-                for k, v in update_values.items():
-                    if getattr(found_prj, k) != v:
-                        setattr(found_prj, k, v)
-
-                        # standardizing project name
-                        if k == NAME_KEY:
-                            if "config" in update_values:
-                                update_values["config"][NAME_KEY] = v
-                            else:
-                                found_prj.config[NAME_KEY] = v
-                                flag_modified(found_prj, "config")
-                            found_prj.name = found_prj.config[NAME_KEY]
-
-                        if k == DESCRIPTION_KEY:
-                            if "config" in update_values:
-                                update_values["config"][DESCRIPTION_KEY] = v
-                            else:
-                                found_prj.config[DESCRIPTION_KEY] = v
-                                # This line needed due to: https://github.com/sqlalchemy/sqlalchemy/issues/5218
-                                flag_modified(found_prj, "config")
-
-                if "samples" in update_dict:
-
-                    if PEPHUB_SAMPLE_ID_KEY not in update_dict["samples"][0]:
-                        raise SampleTableUpdateError(
-                            f"pephub_sample_id '{PEPHUB_SAMPLE_ID_KEY}' is missing in samples."
-                            f"Please provide it to update samples, or use overwrite method."
-                        )
-                    if len(update_dict["samples"]) > MAX_HISTORY_SAMPLES_NUMBER:
-                        _LOGGER.warning(
-                            f"Number of samples in the project exceeds the limit of {MAX_HISTORY_SAMPLES_NUMBER}."
-                            f"Samples won't be updated."
-                        )
-                        new_history = None
+            update_values = UpdateItems(**update_dict)
+
+        update_values = self.__create_update_dict(update_values)
+
+        # config before the update, for the history (only sample updates are saved there)
+        if "samples" in update_dict:
+            old_config = session.scalar(select(Projects.config).where(Projects.id == found_prj.id))
+
+        self._convert_update_schema_id(session, update_values)
+
+        for k, v in update_values.items():
+            if getattr(found_prj, k) != v:
+                setattr(found_prj, k, v)
+
+                # standardizing project name
+                if k == NAME_KEY:
+                    if "config" in update_values:
+                        update_values["config"][NAME_KEY] = v
                     else:
-                        new_history = HistoryProjects(
-                            project_id=found_prj.id,
-                            user=user or namespace,
-                            project_yaml=self.get_config(namespace, name, tag),
-                        )
-                        session.add(new_history)
-
-                    self._update_samples(
-                        project_id=found_prj.id,
-                        samples_list=update_dict["samples"],
-                        sample_name_key=update_dict["config"].get(
-                            SAMPLE_TABLE_INDEX_KEY, "sample_name"
-                        ),
-                        history_sa_model=new_history,
-                    )
-                    found_prj.number_of_samples = len(update_dict["samples"])
+                        found_prj.config[NAME_KEY] = v
+                        flag_modified(found_prj, "config")
+                    found_prj.name = found_prj.config[NAME_KEY]
 
-                if "subsamples" in update_dict:
-                    if found_prj.subsamples_mapping:
-                        for subsample in found_prj.subsamples_mapping:
-                            _LOGGER.debug(f"deleting subsamples: {str(subsample)}")
-                            session.delete(subsample)
+                if k == DESCRIPTION_KEY:
+                    if "config" in update_values:
+                        update_values["config"][DESCRIPTION_KEY] = v
+                    else:
+                        found_prj.config[DESCRIPTION_KEY] = v
+                        # This line needed due to: https://github.com/sqlalchemy/sqlalchemy/issues/5218
+                        flag_modified(found_prj, "config")
 
-                    # Adding new subsamples
-                    if update_dict["subsamples"]:
-                        self._add_subsamples_to_project(found_prj, update_dict["subsamples"])
+        if "samples" in update_dict:
 
-                found_prj.last_update_date = datetime.datetime.now(datetime.timezone.utc)
+            # new samples can be provided without id, but existing samples have to be matched by it
+            if not any(sample.get(PEPHUB_SAMPLE_ID_KEY) for sample in update_dict["samples"]):
+                raise SampleTableUpdateError(
+                    f"pephub_sample_id '{PEPHUB_SAMPLE_ID_KEY}' is missing in samples."
+                    f"Please provide it to update samples, or use overwrite method."
+                )
+            if len(update_dict["samples"]) > MAX_HISTORY_SAMPLES_NUMBER:
+                _LOGGER.warning(
+                    f"Number of samples in the project exceeds the limit of {MAX_HISTORY_SAMPLES_NUMBER}."
+                    f"Samples won't be updated."
+                )
+                new_history = None
+            else:
+                new_history = HistoryProjects(
+                    project_id=found_prj.id,
+                    user=user,
+                    project_yaml=old_config,
+                )
+                session.add(new_history)
+
+            self._update_samples(
+                session=session,
+                project_id=found_prj.id,
+                samples_list=update_dict["samples"],
+                sample_name_key=(update_dict.get("config") or found_prj.config).get(
+                    SAMPLE_TABLE_INDEX_KEY, "sample_name"
+                ),
+                history_sa_model=new_history,
+            )
+            found_prj.number_of_samples = len(update_dict["samples"])
 
-                session.commit()
+        if "subsamples" in update_dict:
+            if found_prj.subsamples_mapping:
+                for subsample in found_prj.subsamples_mapping:
+                    _LOGGER.debug(f"deleting subsamples: {str(subsample)}")
+                    session.delete(subsample)
 
-            return None
+            # Adding new subsamples
+            if update_dict["subsamples"]:
+                self._add_subsamples_to_project(found_prj, update_dict["subsamples"])
 
-        else:
-            raise ProjectNotFoundError("No items will be updated!")
+        found_prj.last_update_date = datetime.datetime.now(datetime.timezone.utc)
 
     @staticmethod
     def _convert_update_schema_id(session: Session, update_values: dict):
@@ -711,6 +786,7 @@ class PEPDatabaseProject:
 
     def _update_samples(
         self,
+        session: Session,
         project_id: int,
         samples_list: List[Dict[str, str]],
         sample_name_key: str = "sample_name",
@@ -721,6 +797,7 @@ class PEPDatabaseProject:
         This is linked list method, that first finds differences in old and new samples list
             and then updates, adds, inserts, deletes, or changes the order.
 
+        :param session: open session object. Session is not committed
         :param project_id: project id in PEPhub database
         :param samples_list: list of samples to be updated
         :param sample_name_key: key of the sample name
@@ -728,118 +805,119 @@ class PEPDatabaseProject:
         :return: None
         """
 
-        with Session(self._sa_engine) as session:
-            old_samples = session.scalars(select(Samples).where(Samples.project_id == project_id))
+        old_samples = session.scalars(select(Samples).where(Samples.project_id == project_id))
+
+        old_samples_mapping: dict = {sample.guid: sample for sample in old_samples}
+
+        # old_child_parent_id needed because of the parent_guid is sometimes set to none in sqlalchemy mapping :( bug
+        old_child_parent_id: Dict[str, str] = {
+            child: mapping.parent_guid for child, mapping in old_samples_mapping.items()
+        }
+
+        old_samples_ids_set: set = set(old_samples_mapping.keys())
+        # new samples can be provided without pephub_sample_id key
+        new_samples_ids_list: list = [
+            new_sample.get(PEPHUB_SAMPLE_ID_KEY)
+            for new_sample in samples_list
+            if new_sample.get(PEPHUB_SAMPLE_ID_KEY) != ""
+            and new_sample.get(PEPHUB_SAMPLE_ID_KEY) is not None
+        ]
+        new_samples_ids_set: set = set(new_samples_ids_list)
+        new_samples_dict: dict = {
+            new_sample.get(PEPHUB_SAMPLE_ID_KEY) or generate_guid(): new_sample
+            for new_sample in samples_list
+        }
+
+        if len(new_samples_ids_list) != len(new_samples_ids_set):
+            raise ProjectDuplicatedSampleGUIDsError(
+                f"Samples have to have unique pephub_sample_id: '{PEPHUB_SAMPLE_ID_KEY}'."
+                f"If ids are duplicated, overwrite the project."
+            )
 
-            old_samples_mapping: dict = {sample.guid: sample for sample in old_samples}
+        # Check if something was deleted:
+        deleted_ids = old_samples_ids_set - new_samples_ids_set
 
-            # old_child_parent_id needed because of the parent_guid is sometimes set to none in sqlalchemy mapping :( bug
-            old_child_parent_id: Dict[str, str] = {
-                child: mapping.parent_guid for child, mapping in old_samples_mapping.items()
-            }
+        del new_samples_ids_list, new_samples_ids_set
 
-            old_samples_ids_set: set = set(old_samples_mapping.keys())
-            new_samples_ids_list: list = [
-                new_sample[PEPHUB_SAMPLE_ID_KEY]
-                for new_sample in samples_list
-                if new_sample[PEPHUB_SAMPLE_ID_KEY] != ""
-                and new_sample[PEPHUB_SAMPLE_ID_KEY] is not None
-            ]
-            new_samples_ids_set: set = set(new_samples_ids_list)
-            new_samples_dict: dict = {
-                new_sample[PEPHUB_SAMPLE_ID_KEY] or generate_guid(): new_sample
-                for new_sample in samples_list
-            }
+        for remove_id in deleted_ids:
 
-            if len(new_samples_ids_list) != len(new_samples_ids_set):
-                raise ProjectDuplicatedSampleGUIDsError(
-                    f"Samples have to have unique pephub_sample_id: '{PEPHUB_SAMPLE_ID_KEY}'."
-                    f"If ids are duplicated, overwrite the project."
+            if history_sa_model:
+                history_sa_model.sample_changes_mapping.append(
+                    HistorySamples(
+                        guid=old_samples_mapping[remove_id].guid,
+                        parent_guid=old_child_parent_id[remove_id],
+                        sample_json=old_samples_mapping[remove_id].sample,
+                        change_type=UpdateTypes.DELETE,
+                    )
                 )
+            session.delete(old_samples_mapping[remove_id])
 
-            # Check if something was deleted:
-            deleted_ids = old_samples_ids_set - new_samples_ids_set
+        parent_id = None
+        parent_mapping = None
 
-            del new_samples_ids_list, new_samples_ids_set
+        # Main loop to update samples
+        for current_id, sample_value in new_samples_dict.items():
+            new_sample = None
+            # new dict, so samples provided by the caller are not modified
+            sample_value = {
+                key: value for key, value in sample_value.items() if key != PEPHUB_SAMPLE_ID_KEY
+            }
 
-            for remove_id in deleted_ids:
+            if current_id not in old_samples_ids_set:
+                new_sample = Samples(
+                    sample=sample_value,
+                    guid=current_id,
+                    sample_name=sample_value[sample_name_key],
+                    project_id=project_id,
+                    parent_mapping=parent_mapping,
+                )
+                session.add(new_sample)
 
                 if history_sa_model:
                     history_sa_model.sample_changes_mapping.append(
                         HistorySamples(
-                            guid=old_samples_mapping[remove_id].guid,
-                            parent_guid=old_child_parent_id[remove_id],
-                            sample_json=old_samples_mapping[remove_id].sample,
-                            change_type=UpdateTypes.DELETE,
+                            guid=new_sample.guid,
+                            parent_guid=new_sample.parent_guid,
+                            sample_json=new_sample.sample,
+                            change_type=UpdateTypes.INSERT,
                         )
                     )
-                session.delete(old_samples_mapping[remove_id])
-
-            parent_id = None
-            parent_mapping = None
-
-            # Main loop to update samples
-            for current_id, sample_value in new_samples_dict.items():
-                new_sample = None
-                del sample_value[PEPHUB_SAMPLE_ID_KEY]
-
-                if current_id not in old_samples_ids_set:
-                    new_sample = Samples(
-                        sample=sample_value,
-                        guid=current_id,
-                        sample_name=sample_value[sample_name_key],
-                        project_id=project_id,
-                        parent_mapping=parent_mapping,
-                    )
-                    session.add(new_sample)
+
+            else:
+                current_history = None
+                if old_samples_mapping[current_id].sample != sample_value:
 
                     if history_sa_model:
-                        history_sa_model.sample_changes_mapping.append(
-                            HistorySamples(
-                                guid=new_sample.guid,
-                                parent_guid=new_sample.parent_guid,
-                                sample_json=new_sample.sample,
-                                change_type=UpdateTypes.INSERT,
-                            )
+                        current_history = HistorySamples(
+                            guid=old_samples_mapping[current_id].guid,
+                            parent_guid=old_samples_mapping[current_id].parent_guid,
+                            sample_json=old_samples_mapping[current_id].sample,
+                            change_type=UpdateTypes.UPDATE,
                         )
 
-                else:
-                    current_history = None
-                    if old_samples_mapping[current_id].sample != sample_value:
+                    old_samples_mapping[current_id].sample = sample_value
+                    old_samples_mapping[current_id].sample_name = sample_value[sample_name_key]
 
-                        if history_sa_model:
+                # !bug workaround: if project was deleted and sometimes old_samples_mapping[current_id].parent_guid
+                # and it can cause an error in history. For this we have `old_child_parent_id` dict
+                if old_samples_mapping[current_id].parent_guid != parent_id:
+                    if history_sa_model:
+                        if current_history:
+                            current_history.parent_guid = parent_id
+                        else:
                             current_history = HistorySamples(
                                 guid=old_samples_mapping[current_id].guid,
-                                parent_guid=old_samples_mapping[current_id].parent_guid,
+                                parent_guid=old_child_parent_id[current_id],
                                 sample_json=old_samples_mapping[current_id].sample,
                                 change_type=UpdateTypes.UPDATE,
                             )
+                    old_samples_mapping[current_id].parent_mapping = parent_mapping
 
-                        old_samples_mapping[current_id].sample = sample_value
-                        old_samples_mapping[current_id].sample_name = sample_value[sample_name_key]
-
-                    # !bug workaround: if project was deleted and sometimes old_samples_mapping[current_id].parent_guid
-                    # and it can cause an error in history. For this we have `old_child_parent_id` dict
-                    if old_samples_mapping[current_id].parent_guid != parent_id:
-                        if history_sa_model:
-                            if current_history:
-                                current_history.parent_guid = parent_id
-                            else:
-                                current_history = HistorySamples(
-                                    guid=old_samples_mapping[current_id].guid,
-                                    parent_guid=old_child_parent_id[current_id],
-                                    sample_json=old_samples_mapping[current_id].sample,
-                                    change_type=UpdateTypes.UPDATE,
-                                )
-                        old_samples_mapping[current_id].parent_mapping = parent_mapping
-
-                    if history_sa_model and current_history:
-                        history_sa_model.sample_changes_mapping.append(current_history)
-
-                parent_id = current_id
-                parent_mapping = new_sample or old_samples_mapping[current_id]
+                if history_sa_model and current_history:
+                    history_sa_model.sample_changes_mapping.append(current_history)
 
-            session.commit()
+            parent_id = current_id
+            parent_mapping = new_sample or old_samples_mapping[current_id]
 
     @staticmethod
     def __create_update_dict(update_values: UpdateItems) -> dict:
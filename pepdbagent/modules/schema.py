@@ -1,4 +1,5 @@
 import logging
+from typing import Dict, List
 
 from sqlalchemy import Select, and_, delete, func, or_, select
 from sqlalchemy.exc import IntegrityError
@@ -339,10 +340,12 @@ class PEPDatabaseSchema:
         """
 
         with Session(self._sa_engine) as session:
-            schema_obj = session.scalar(
-                select(Schemas).where(and_(Schemas.namespace == namespace, Schemas.name == name))
+            schema_id = session.scalar(
+                select(Schemas.id).where(
+                    and_(Schemas.namespace == namespace, Schemas.name == name)
+                )
             )
-            return True if schema_obj else False
+            return schema_id is not None
 
     def group_create(self, namespace: str, name: str, description: str = "") -> None:
         """
@@ -368,6 +371,34 @@ class PEPDatabaseSchema:
         except IntegrityError:
             raise SchemaGroupAlreadyExistsError
 
+    def group_create_many(self, groups: List[Dict[str, str]]) -> None:
+        """
+        Create several schema groups in the database in one transaction.
+        If one of the groups already exists, none of them is created.
+
+        :param groups: list of dicts with schema group info, e.g.
+            [{"namespace": "namespace1", "name": "group1", "description": "my group"}]
+            description is optional [Default: ""]
+
+        :return: None
+        """
+        try:
+            with Session(self._sa_engine) as session:
+                session.add_all(
+                    [
+                        SchemaGroups(
+                            namespace=group["namespace"],
+                            name=group["name"],
+                            description=group.get("description", ""),
+                        )
+                        for group in groups
+                    ]
+                )
+                session.commit()
+
+        except IntegrityError:
+            raise SchemaGroupAlreadyExistsError
+
     def group_get(self, namespace: str, name: str) -> SchemaGroupAnnotation:
         """
         Get schema group from the database.
@@ -633,9 +664,9 @@ class PEPDatabaseSchema:
         """
 
         with Session(self._sa_engine) as session:
-            schema_group_obj = session.scalar(
-                select(SchemaGroups).where(
+            schema_group_id = session.scalar(
+                select(SchemaGroups.id).where(
                     and_(SchemaGroups.namespace == namespace, SchemaGroups.name == name)
                 )
             )
-            return True if schema_group_obj else False
+            return schema_group_id is not None
@@ -4,11 +4,11 @@ import pytest
 
 from pepdbagent.exceptions import FilterError, ProjectNotFoundError
 
-from .utils import PEPDBAgentContextManager
+from .utils import PEPDBAgentContextManager, db_available
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestAnnotation:
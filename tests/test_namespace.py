@@ -2,11 +2,11 @@ import pytest
 
 from pepdbagent.exceptions import ProjectAlreadyInFavorites, ProjectNotInFavorites
 
-from .utils import PEPDBAgentContextManager
+from .utils import PEPDBAgentContextManager, db_available
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestNamespace:
@@ -58,7 +58,7 @@ class TestNamespace:
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestFavorites:
@@ -159,7 +159,7 @@ class TestFavorites:
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestUser:
@@ -1,14 +1,39 @@
-import numpy as np
-import peppy
 import pytest
 
 from pepdbagent.exceptions import ProjectNotFoundError
 
-from .utils import PEPDBAgentContextManager, get_path_to_example_file, list_of_available_peps
+from .utils import (
+    PEPDBAgentContextManager,
+    db_available,
+    get_example_project_records,
+    get_example_project_sample_dicts,
+    get_example_sample_records,
+    load_example_project,
+    project_sample_dicts,
+)
+
+GET_PROJECT_CASES = (
+    ("namespace1", "amendments1"),
+    ("namespace1", "amendments2"),
+    ("namespace1", "basic"),
+    ("namespace2", "derive"),
+    ("namespace2", "imply"),
+    ("namespace3", "piface"),
+    ("namespace3", "subtable2"),
+)
+SUBTABLES_CASES = (("namespace3", "subtables"),)
+AMENDMENTS_CASES = (
+    ("namespace1", "amendments1"),
+    ("namespace1", "amendments2"),
+)
+
+
+def case_ids(cases) -> list:
+    return ["/".join(case) for case in cases]
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestProject:
@@ -18,38 +43,25 @@ class TestProject:
 
     def test_create_project(self):
         with PEPDBAgentContextManager(add_data=False) as agent:
-            prj = peppy.Project(list_of_available_peps()["namespace3"]["subtables"])
+            prj = load_example_project("namespace3", "subtables")
             agent.project.create(prj, namespace="test", name="imply", overwrite=False)
             assert True
 
     def test_create_project_from_dict(self):
         with PEPDBAgentContextManager(add_data=False) as agent:
-            prj = peppy.Project(list_of_available_peps()["namespace3"]["subtables"])
             agent.project.create(
-                prj.to_dict(extended=True, orient="records"),
+                get_example_project_records("namespace3", "subtables"),
                 namespace="test",
                 name="imply",
                 overwrite=True,
             )
             assert True
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace1", "amendments2"],
-            ["namespace1", "basic"],
-            ["namespace2", "derive"],
-            ["namespace2", "imply"],
-            ["namespace3", "piface"],
-            ["namespace3", "subtable2"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", GET_PROJECT_CASES, ids=case_ids(GET_PROJECT_CASES))
     def test_get_project(self, namespace, name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             kk = agent.project.get(namespace=namespace, name=name, tag="default", raw=False)
-            ff = peppy.Project(get_path_to_example_file(namespace, name))
-            assert kk == ff
+            assert project_sample_dicts(kk) == get_example_project_sample_dicts(namespace, name)
 
     @pytest.mark.parametrize(
         "namespace, name",
@@ -65,17 +77,10 @@ class TestProject:
                 name=name,
                 tag="default",
             )
-            ff = peppy.Project(get_path_to_example_file(namespace, name))
-            ff["_original_config"]["description"] = description
-            ff["_original_config"]["name"] = name
-            assert kk == ff["_original_config"]
+            ff = load_example_project(namespace, name)
+            assert kk == dict(ff["_original_config"], description=description, name=name)
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace3", "subtables"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", SUBTABLES_CASES, ids=case_ids(SUBTABLES_CASES))
     def test_get_subsamples(self, namespace, name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj_subtables = agent.project.get_subsamples(
@@ -83,37 +88,17 @@ class TestProject:
                 name=name,
                 tag="default",
             )
-            orgiginal_prj = peppy.Project(get_path_to_example_file(namespace, name))
-
-            assert (
-                prj_subtables
-                == orgiginal_prj.to_dict(extended=True, orient="records")["_subsample_list"]
-            )
+            assert prj_subtables == get_example_project_records(namespace, name)["_subsample_list"]
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace3", "subtables"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", SUBTABLES_CASES, ids=case_ids(SUBTABLES_CASES))
     def test_get_samples_raw(self, namespace, name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj_samples = agent.project.get_samples(
                 namespace=namespace, name=name, tag="default", raw=True
             )
-            orgiginal_prj = peppy.Project(get_path_to_example_file(namespace, name))
+            assert prj_samples == get_example_project_records(namespace, name)["_sample_dict"]
 
-            assert (
-                prj_samples
-                == orgiginal_prj.to_dict(extended=True, orient="records")["_sample_dict"]
-            )
-
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace3", "subtables"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", SUBTABLES_CASES, ids=case_ids(SUBTABLES_CASES))
     def test_get_samples_processed(self, namespace, name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj_samples = agent.project.get_samples(
@@ -122,24 +107,21 @@ class TestProject:
                 tag="default",
                 raw=False,
             )
-            orgiginal_prj = peppy.Project(get_path_to_example_file(namespace, name))
-
-            assert prj_samples == orgiginal_prj.sample_table.replace({np.nan: None}).to_dict(
-                orient="records"
-            )
+            assert prj_samples == get_example_sample_records(namespace, name)
 
     @pytest.mark.parametrize(
-        "namespace, name,tag",
+        "namespace, name, tag, add_data",
         [
-            ["incorrect_namespace", "amendments1", "default"],
-            ["namespace1", "subtable2", "default"],
-            ["namespace3", "basic", "default"],
-            ["namespace3", "subtable2", "incorrect_tag"],
-            ["namespace1", "incorrect_name", "default"],
+            ["incorrect_namespace", "amendments1", "default", False],
+            # projects below exist in db, but with different namespace or tag
+            ["namespace1", "subtable2", "default", True],
+            ["namespace3", "basic", "default", True],
+            ["namespace3", "subtable2", "incorrect_tag", True],
+            ["namespace1", "incorrect_name", "default", False],
         ],
     )
-    def test_get_project_error(self, namespace, name, tag):
-        with PEPDBAgentContextManager(add_data=True) as agent:
+    def test_get_project_error(self, namespace, name, tag, add_data):
+        with PEPDBAgentContextManager(add_data=add_data) as agent:
             with pytest.raises(ProjectNotFoundError, match="Project does not exist."):
                 agent.project.get(namespace=namespace, name=name, tag=tag)
 
@@ -181,7 +163,7 @@ class TestProject:
                 agent.project.get(namespace=namespace, name=name, tag="default")
 
     def test_delete_not_existing_project(self):
-        with PEPDBAgentContextManager(add_data=True) as agent:
+        with PEPDBAgentContextManager(add_data=False) as agent:
             with pytest.raises(ProjectNotFoundError, match="Project does not exist."):
                 agent.project.delete(namespace="namespace1", name="nothing", tag="default")
 
@@ -210,13 +192,7 @@ class TestProject:
             )
             assert result.results[0].forked_from == f"{namespace}/{name}:default"
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace1", "amendments2"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", AMENDMENTS_CASES, ids=case_ids(AMENDMENTS_CASES))
     def test_parent_project_delete(self, namespace, name):
         """
         Test if parent project is deleted, forked project is not deleted
@@ -235,13 +211,7 @@ class TestProject:
             agent.project.delete(namespace=namespace, name=name, tag="default")
             assert agent.project.exists(namespace="new_namespace", name="new_name", tag="new_tag")
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace1", "amendments2"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", AMENDMENTS_CASES, ids=case_ids(AMENDMENTS_CASES))
     def test_child_project_delete(self, namespace, name):
         """
         Test if child project is deleted, parent project is not deleted
@@ -261,13 +231,7 @@ class TestProject:
             agent.project.delete(namespace="new_namespace", name="new_name", tag="new_tag")
             assert agent.project.exists(namespace=namespace, name=name, tag="default")
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace1", "amendments2"],
-        ],
-    )
+    @pytest.mark.parametrize("namespace, name", AMENDMENTS_CASES, ids=case_ids(AMENDMENTS_CASES))
     def test_project_can_be_forked_twice(self, namespace, name):
         """
         Test if project can be forked twice
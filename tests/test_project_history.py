@@ -1,14 +1,55 @@
-import peppy
+import copy
+
 import pytest
 
 from pepdbagent.const import PEPHUB_SAMPLE_ID_KEY
 from pepdbagent.exceptions import HistoryNotFoundError
 
-from .utils import PEPDBAgentContextManager
+from .utils import PEPDBAgentContextManager, db_available
+
+HISTORY_CASE = pytest.mark.parametrize(
+    "namespace, name, sample_name",
+    [
+        ["namespace1", "amendments1", "pig_0h"],
+    ],
+)
+
+
+def _produce_two_history_entries(agent, namespace: str, name: str, tag: str = "default"):
+    """
+    Update project twice (delete one sample, then add a new one) in one transaction,
+    so it gets two history entries
+
+    :return: raw project before the updates, raw project (with sample ids) after the updates
+    """
+    prj = agent.project.get(namespace, name, tag=tag, with_id=True)
+    # original state is built locally, instead of fetching the project once more without ids
+    prj_org = copy.deepcopy(prj)
+    for sample in prj_org["_sample_dict"]:
+        del sample[PEPHUB_SAMPLE_ID_KEY]
+
+    del prj["_sample_dict"][1]
+    first_update = {"samples": list(prj["_sample_dict"])}
+
+    new_sample1 = {
+        "sample_name": "new_sample",
+        "protocol": "new_protocol",
+        PEPHUB_SAMPLE_ID_KEY: None,
+    }
+    prj["_sample_dict"].append(new_sample1)
+    second_update = {"samples": prj["_sample_dict"]}
+
+    agent.project.update_many(
+        namespace=namespace,
+        name=name,
+        tag=tag,
+        updates=[first_update, second_update],
+    )
+    return prj_org, prj
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestProjectHistory:
@@ -16,12 +57,7 @@ class TestProjectHistory:
     Test project methods
     """
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_get_add_history_all_annotation(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj = agent.project.get(namespace, name, tag="default", with_id=True)
@@ -41,26 +77,21 @@ class TestProjectHistory:
                 PEPHUB_SAMPLE_ID_KEY: None,
             }
 
-            prj["_sample_dict"].append(new_sample1.copy())
-            prj["_sample_dict"].append(new_sample2.copy())
+            prj["_sample_dict"].append(new_sample1)
+            prj["_sample_dict"].append(new_sample2)
 
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
+                update_dict={"samples": prj["_sample_dict"]},
             )
 
             project_history = agent.project.get_history(namespace, name, tag="default")
 
             assert len(project_history.history) == 1
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_get_add_history_all_project(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj_init = agent.project.get(namespace, name, tag="default", raw=False)
@@ -81,14 +112,14 @@ class TestProjectHistory:
                 PEPHUB_SAMPLE_ID_KEY: None,
             }
 
-            prj["_sample_dict"].append(new_sample1.copy())
-            prj["_sample_dict"].append(new_sample2.copy())
+            prj["_sample_dict"].append(new_sample1)
+            prj["_sample_dict"].append(new_sample2)
 
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
+                update_dict={"samples": prj["_sample_dict"]},
             )
 
             history_prj = agent.project.get_project_from_history(
@@ -96,51 +127,16 @@ class TestProjectHistory:
             )
             assert prj_init == history_prj
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_get_history_multiple_changes(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            del prj["_sample_dict"][1]
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            new_sample1 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-            prj["_sample_dict"].append(new_sample1.copy())
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
+            _produce_two_history_entries(agent, namespace, name)
 
             history = agent.project.get_history(namespace, name, tag="default")
 
             assert len(history.history) == 2
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_get_project_incorrect_history_id(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj = agent.project.get(namespace, name, tag="default", with_id=True)
@@ -150,7 +146,7 @@ class TestProjectHistory:
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
+                update_dict={"samples": prj["_sample_dict"]},
             )
 
             with pytest.raises(HistoryNotFoundError):
@@ -158,51 +154,16 @@ class TestProjectHistory:
                     namespace, "amendments2", tag="default", history_id=1, raw=False
                 )
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_get_history_none(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             history_annot = agent.project.get_history(namespace, name, tag="default")
             assert len(history_annot.history) == 0
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_delete_all_history(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            del prj["_sample_dict"][1]
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            new_sample1 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-            prj["_sample_dict"].append(new_sample1.copy())
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
+            _produce_two_history_entries(agent, namespace, name)
 
             history = agent.project.get_history(namespace, name, tag="default")
 
@@ -216,40 +177,10 @@ class TestProjectHistory:
             project_exists = agent.project.exists(namespace, name, tag="default")
             assert project_exists
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_delete_one_history(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            del prj["_sample_dict"][1]
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            new_sample1 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-            prj["_sample_dict"].append(new_sample1.copy())
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
+            _produce_two_history_entries(agent, namespace, name)
 
             history = agent.project.get_history(namespace, name, tag="default")
 
@@ -262,41 +193,10 @@ class TestProjectHistory:
             assert len(history.history) == 1
             assert history.history[0].change_id == 2
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
+    @HISTORY_CASE
     def test_restore_project(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            prj_org = agent.project.get(namespace, name, tag="default", with_id=False)
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            del prj["_sample_dict"][1]
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            prj = agent.project.get(namespace, name, tag="default", with_id=True)
-
-            new_sample1 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-            prj["_sample_dict"].append(new_sample1.copy())
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
+            prj_org, _ = _produce_two_history_entries(agent, namespace, name)
 
             agent.project.restore(namespace, name, tag="default", history_id=1)
 
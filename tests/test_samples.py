@@ -1,13 +1,15 @@
+import datetime
+
 import peppy
 import pytest
 
 from pepdbagent.exceptions import SampleNotFoundError
 
-from .utils import PEPDBAgentContextManager
+from .utils import PEPDBAgentContextManager, db_available
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestSamples:
@@ -129,9 +131,6 @@ class TestSamples:
     def test_project_timestamp_was_changed(self, namespace, name, sample_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             annotation1 = agent.annotation.get(namespace, name, "default")
-            import time
-
-            time.sleep(0.2)
             agent.sample.update(
                 namespace=namespace,
                 name=name,
@@ -141,9 +140,10 @@ class TestSamples:
             )
             annotation2 = agent.annotation.get(namespace, name, "default")
 
-            assert (
-                annotation1.results[0].last_update_date != annotation2.results[0].last_update_date
-            )
+            # template database was seeded before the update, so no clock patching is needed
+            assert datetime.datetime.fromisoformat(
+                annotation2.results[0].last_update_date
+            ) > datetime.datetime.fromisoformat(annotation1.results[0].last_update_date)
 
     @pytest.mark.parametrize(
         "namespace, name, sample_name",
@@ -203,13 +203,11 @@ class TestSamples:
     )
     def test_overwrite_sample(self, namespace, name, tag, sample_dict):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            assert agent.project.get(namespace, name, raw=False).get_sample("pig_0h").time == "0"
+            # fetch just the sample, not the whole project
+            assert agent.sample.get(namespace, name, "pig_0h", tag=tag)["time"] == "0"
             agent.sample.add(namespace, name, tag, sample_dict, overwrite=True)
 
-            assert (
-                agent.project.get(namespace, name, raw=False).get_sample("pig_0h").time
-                == "new_time"
-            )
+            assert agent.sample.get(namespace, name, "pig_0h", tag=tag)["time"] == "new_time"
 
     @pytest.mark.parametrize(
         "namespace, name, tag, sample_dict",
@@ -1,10 +1,12 @@
 import pytest
 
-from .utils import PEPDBAgentContextManager
+from pepdbagent.exceptions import SchemaGroupAlreadyExistsError
+
+from .utils import PEPDBAgentContextManager, db_available
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestSchemas:
@@ -88,7 +90,7 @@ class TestSchemas:
         ],
     )
     def test_annotation_popular(self, namespace, name):
-        with PEPDBAgentContextManager(add_data=True, add_schemas=True) as agent:
+        with PEPDBAgentContextManager(add_data=True) as agent:
             agent.project.update(
                 namespace="namespace1",
                 name="amendments1",
@@ -97,40 +99,23 @@ class TestSchemas:
             schema_annot = agent.schema.info(namespace=namespace, name=name)
             assert schema_annot.popularity_number == 1
 
-    def test_search(self):
-        with PEPDBAgentContextManager(add_schemas=True) as agent:
-            results = agent.schema.search(namespace="namespace2")
-            assert results
-            assert results.count == 3
-            assert len(results.results) == 3
-
-    def test_search_offset(self):
-        with PEPDBAgentContextManager(add_schemas=True) as agent:
-            results = agent.schema.search(namespace="namespace2", offset=1)
-            assert results
-            assert results.count == 3
-            assert len(results.results) == 2
-
-    def test_search_limit(self):
-        with PEPDBAgentContextManager(add_schemas=True) as agent:
-            results = agent.schema.search(namespace="namespace2", limit=1)
-            assert results
-            assert results.count == 3
-            assert len(results.results) == 1
-
-    def test_search_limit_offset(self):
-        with PEPDBAgentContextManager(add_schemas=True) as agent:
-            results = agent.schema.search(namespace="namespace2", limit=2, offset=2)
-            assert results
-            assert results.count == 3
-            assert len(results.results) == 1
-
-    def test_search_query(self):
+    @pytest.mark.parametrize(
+        "search_kwargs, count, number_of_results",
+        [
+            [{}, 3, 3],
+            [{"offset": 1}, 3, 2],
+            [{"limit": 1}, 3, 1],
+            [{"limit": 2, "offset": 2}, 3, 1],
+            [{"search_str": "bedb"}, 2, 2],
+        ],
+        ids=["all", "offset", "limit", "limit_offset", "query"],
+    )
+    def test_search(self, search_kwargs, count, number_of_results):
         with PEPDBAgentContextManager(add_schemas=True) as agent:
-            results = agent.schema.search(namespace="namespace2", search_str="bedb")
+            results = agent.schema.search(namespace="namespace2", **search_kwargs)
             assert results
-            assert results.count == 2
-            assert len(results.results) == 2
+            assert results.count == count
+            assert len(results.results) == number_of_results
 
     @pytest.mark.parametrize(
         "namespace, name",
@@ -146,6 +131,19 @@ class TestSchemas:
             )
             assert agent.schema.group_exist(namespace=namespace, name=group_name)
 
+    def test_create_many_groups_is_atomic(self):
+        namespace = "namespace1"
+        with PEPDBAgentContextManager(add_schemas=True) as agent:
+            agent.schema.group_create(namespace=namespace, name="existing_group")
+            with pytest.raises(SchemaGroupAlreadyExistsError):
+                agent.schema.group_create_many(
+                    [
+                        {"namespace": namespace, "name": "new_group"},
+                        {"namespace": namespace, "name": "existing_group"},
+                    ]
+                )
+            assert not agent.schema.group_exist(namespace=namespace, name="new_group")
+
     @pytest.mark.parametrize(
         "namespace, name",
         [
@@ -209,12 +207,12 @@ class TestSchemas:
             group_name1 = "new_group1"
             group_name2 = "new2"
             group_name3 = "new_group3"
-            agent.schema.group_create(
-                namespace="namespace1", name=group_name1, description="new group"
-            )
-            agent.schema.group_create(namespace="namespace1", name=group_name2, description="new")
-            agent.schema.group_create(
-                namespace="namespace1", name=group_name3, description="new group"
+            agent.schema.group_create_many(
+                [
+                    {"namespace": "namespace1", "name": group_name1, "description": "new group"},
+                    {"namespace": "namespace1", "name": group_name2, "description": "new"},
+                    {"namespace": "namespace1", "name": group_name3, "description": "new group"},
+                ]
             )
 
             results = agent.schema.group_search(search_str="new_group")
@@ -4,11 +4,25 @@ import pytest
 
 from pepdbagent.models import TarNamespaceModel
 
-from .utils import PEPDBAgentContextManager
+from .utils import PEPDBAgentContextManager, db_available
+
+_NOW = datetime.now()
+
+
+@pytest.fixture(scope="class")
+def tar_info(request) -> TarNamespaceModel:
+    return TarNamespaceModel(
+        namespace=request.cls.test_namespace,
+        submission_date=_NOW,
+        start_period=_NOW,
+        end_period=_NOW,
+        number_of_projects=1,
+        file_path="blabla/test.tar",
+    )
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestGeoTar:
@@ -18,27 +32,22 @@ class TestGeoTar:
 
     test_namespace = "namespace1"
 
-    tar_info = TarNamespaceModel(
-        namespace=test_namespace,
-        submission_date=datetime.now(),
-        start_period=datetime.now(),
-        end_period=datetime.now(),
-        number_of_projects=1,
-        file_path="blabla/test.tar",
-    )
-
-    def test_create_meta_tar(self):
+    def test_create_meta_tar(self, tar_info):
         with PEPDBAgentContextManager(add_data=True) as agent:
 
-            agent.namespace.upload_tar_info(tar_info=self.tar_info)
+            result = agent.namespace.upload_tar_info(tar_info=tar_info)
 
-            result = agent.namespace.get_tar_info(namespace=self.test_namespace)
+            assert result.identifier is not None
+            assert result.creation_date is not None
+            assert result.namespace == self.test_namespace
+            assert result.file_path == tar_info.file_path
 
-            assert result.count == 1
+            # the record is saved in the database
+            assert agent.namespace.get_tar_info(namespace=self.test_namespace).count == 1
 
-    def test_delete_meta_tar(self):
+    def test_delete_meta_tar(self, tar_info):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.namespace.upload_tar_info(tar_info=self.tar_info)
+            agent.namespace.upload_tar_info(tar_info=tar_info)
 
             result = agent.namespace.get_tar_info(namespace=self.test_namespace)
             assert result.count == 1
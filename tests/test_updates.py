@@ -1,15 +1,124 @@
+from types import MappingProxyType
+from typing import Union
+
 import peppy
 import pytest
 from peppy.exceptions import IllegalStateException
 
 from pepdbagent.const import PEPHUB_SAMPLE_ID_KEY
-from pepdbagent.exceptions import ProjectDuplicatedSampleGUIDsError, SampleTableUpdateError
+from pepdbagent.exceptions import (
+    ProjectDuplicatedSampleGUIDsError,
+    SampleTableUpdateError,
+    SchemaDoesNotExistError,
+)
+
+from .utils import PEPDBAgentContextManager, db_available
+
+# read-only templates of samples added in tests
+_NEW_SAMPLE = MappingProxyType({"sample_name": "new_sample", "protocol": "new_protocol"})
+_NEW_SAMPLE2 = MappingProxyType({"sample_name": "new_sample2", "protocol": "new_protocol2"})
+
+
+def _update_whole_table(samples: list) -> None:
+    samples.append({**_NEW_SAMPLE, PEPHUB_SAMPLE_ID_KEY: None})
+    samples[0]["sample_name"] = "new_sample_name2"
+    del samples[1]
+
+
+def _insert_row(samples: list) -> None:
+    samples.append({**_NEW_SAMPLE, PEPHUB_SAMPLE_ID_KEY: None})
+
+
+def _insert_row_without_id_key(samples: list) -> None:
+    samples.append(dict(_NEW_SAMPLE))
+
+
+def _insert_multiple_rows(samples: list) -> None:
+    samples.append({**_NEW_SAMPLE, PEPHUB_SAMPLE_ID_KEY: None})
+    samples.append({**_NEW_SAMPLE2, PEPHUB_SAMPLE_ID_KEY: None})
+
+
+def _delete_multiple_rows(samples: list) -> None:
+    del samples[1]
+    del samples[2]
+
+
+def _modify_one_row(samples: list) -> None:
+    samples[0]["sample_name"] = "new_sample_name2"
+
+
+def _modify_multiple_rows(samples: list) -> None:
+    samples[0]["sample_name"] = "new_sample_name2"
+    samples[1]["sample_name"] = "new_sample_name3"
+
+
+def _add_new_first_sample(samples: list) -> None:
+    samples.insert(0, {**_NEW_SAMPLE, PEPHUB_SAMPLE_ID_KEY: None})
+
+
+def _add_new_first_sample_without_id_key(samples: list) -> None:
+    samples.insert(0, dict(_NEW_SAMPLE))
+
+
+def _change_sample_order(samples: list) -> None:
+    samples[0], samples[1] = samples[1], samples[0]
+
+
+# ways to set config value: directly, or in the config of the whole project (raw dict or peppy)
+CONFIG_UPDATE_MODES = pytest.mark.parametrize(
+    "mode, project_type", [("direct", None), ("in_config", "raw"), ("in_config", "peppy")]
+)
+
+# in-place changes of the sample table (with ids), that are sent to project.update
+SAMPLE_TABLE_MUTATIONS = {
+    "update_whole_table": _update_whole_table,
+    "insert_row": _insert_row,
+    "insert_row_without_id_key": _insert_row_without_id_key,
+    "insert_multiple_rows": _insert_multiple_rows,
+    "delete_multiple_rows": _delete_multiple_rows,
+    "modify_one_row": _modify_one_row,
+    "modify_multiple_rows": _modify_multiple_rows,
+    "add_new_first_sample": _add_new_first_sample,
+    "add_new_first_sample_without_id_key": _add_new_first_sample_without_id_key,
+    "change_sample_order": _change_sample_order,
+}
+
+SAMPLE_TABLE_MUTATION_CASES = [
+    (mutation, namespace, name)
+    for mutation in SAMPLE_TABLE_MUTATIONS
+    for namespace, name in (
+        [("namespace3", "subtable2"), ("namespace1", "append")]
+        if mutation == "delete_multiple_rows"
+        else [("namespace1", "amendments1"), ("namespace3", "subtable1")]
+    )
+]
 
-from .utils import PEPDBAgentContextManager
+
+def _project_for_update(prj: dict, project_type: str) -> Union[dict, peppy.Project]:
+    """
+    Get project in the form, that is sent to project.update: raw dict or peppy.Project
+    """
+    if project_type == "peppy":
+        return peppy.Project.from_dict(prj)
+    return prj
+
+
+def _build_update_dict(
+    agent, namespace: str, name: str, key: str, value: str, mode: str, project_type: str
+) -> dict:
+    """
+    Build update_dict that sets project config value either directly ("direct")
+    or through the whole project ("in_config") provided as raw dict or peppy.Project
+    """
+    if mode == "direct":
+        return {key: value}
+    prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
+    prj["_config"][key] = value
+    return {"project": _project_for_update(prj, project_type)}
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestProjectUpdate:
@@ -20,32 +129,16 @@ class TestProjectUpdate:
             ["namespace1", "amendments2", "name2"],
         ],
     )
-    def test_update_project_name(self, namespace, name, new_name):
+    @CONFIG_UPDATE_MODES
+    def test_update_project_name(self, namespace, name, new_name, mode, project_type):
         with PEPDBAgentContextManager(add_data=True) as agent:
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"name": new_name},
-            )
-            assert agent.project.exists(namespace=namespace, name=new_name, tag="default")
-
-    @pytest.mark.parametrize(
-        "namespace, name,new_name",
-        [
-            ["namespace1", "amendments1", "name1"],
-            ["namespace1", "amendments2", "name2"],
-        ],
-    )
-    def test_update_project_name_in_config(self, namespace, name, new_name):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            prj = agent.project.get(namespace=namespace, name=name, raw=False, with_id=True)
-            prj.name = new_name
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": prj},
+                update_dict=_build_update_dict(
+                    agent, namespace, name, "name", new_name, mode, project_type
+                ),
             )
             assert agent.project.exists(namespace=namespace, name=new_name, tag="default")
 
@@ -73,21 +166,22 @@ class TestProjectUpdate:
             ["namespace2", "derive", "desc5 f"],
         ],
     )
-    def test_update_project_description(self, namespace, name, new_description):
+    @CONFIG_UPDATE_MODES
+    def test_update_project_description(
+        self, namespace, name, new_description, mode, project_type
+    ):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            prj = agent.project.get(namespace=namespace, name=name, raw=False)
-            prj.description = new_description
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"description": new_description},
+                update_dict=_build_update_dict(
+                    agent, namespace, name, "description", new_description, mode, project_type
+                ),
             )
 
-            assert (
-                agent.project.get(namespace=namespace, name=name, raw=False).description
-                == new_description
-            )
+            config = agent.project.get_config(namespace=namespace, name=name, tag="default")
+            assert config["description"] == new_description
 
     @pytest.mark.parametrize(
         "namespace, name, new_schema",
@@ -110,28 +204,6 @@ class TestProjectUpdate:
             prj_annot = agent.annotation.get(namespace=namespace, name=name)
             assert prj_annot.results[0].pep_schema == "namespace2/bedboss"
 
-    @pytest.mark.parametrize(
-        "namespace, name, new_description",
-        [
-            ["namespace1", "amendments1", "desc1 f"],
-        ],
-    )
-    def test_update_project_description_in_config(self, namespace, name, new_description):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            prj = agent.project.get(namespace=namespace, name=name, raw=False, with_id=True)
-            prj.description = new_description
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": prj},
-            )
-
-            assert (
-                agent.project.get(namespace=namespace, name=name, raw=False).description
-                == new_description
-            )
-
     @pytest.mark.parametrize(
         "namespace, name",
         [
@@ -194,6 +266,48 @@ class TestProjectUpdate:
             )
             assert is_private is True
 
+    @pytest.mark.parametrize(
+        "namespace, name",
+        [
+            ["namespace1", "amendments1"],
+        ],
+    )
+    def test_update_many(self, namespace, name):
+        with PEPDBAgentContextManager(add_data=True) as agent:
+            agent.project.update_many(
+                namespace=namespace,
+                name=name,
+                tag="default",
+                updates=[{"is_private": True}, {"description": "new description"}],
+            )
+
+            annotation = agent.annotation.get(
+                namespace=namespace, name=name, tag="default", admin=[namespace]
+            ).results[0]
+            assert annotation.is_private is True
+            assert annotation.description == "new description"
+
+    @pytest.mark.parametrize(
+        "namespace, name",
+        [
+            ["namespace1", "amendments1"],
+        ],
+    )
+    def test_update_many_is_atomic(self, namespace, name):
+        with PEPDBAgentContextManager(add_data=True) as agent:
+            with pytest.raises(SchemaDoesNotExistError):
+                agent.project.update_many(
+                    namespace=namespace,
+                    name=name,
+                    tag="default",
+                    updates=[{"is_private": True}, {"pep_schema": "namespace1/does_not_exist"}],
+                )
+
+            annotation = agent.annotation.get(
+                namespace=namespace, name=name, tag="default", admin=[namespace]
+            ).results[0]
+            assert annotation.is_private is False
+
     @pytest.mark.parametrize(
         "namespace, name",
         [
@@ -247,8 +361,7 @@ class TestProjectUpdate:
         ensure that update works correctly
         """
         with PEPDBAgentContextManager(add_data=True) as agent:
-            new_prj = agent.project.get(namespace=namespace, name=name, raw=False, with_id=True)
-            prj_dict = new_prj.to_dict(extended=True, orient="records")
+            prj_dict = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
 
             prj_dict["_sample_dict"].append(
                 {
@@ -265,12 +378,11 @@ class TestProjectUpdate:
                 }
             )
 
-            new_prj.description = "new_description"
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj_dict)},
+                update_dict={"project": prj_dict},
             )
 
             prj = agent.project.get(namespace=namespace, name=name, raw=True)
@@ -279,126 +391,73 @@ class TestProjectUpdate:
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestUpdateProjectWithId:
     @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
+        "mutation, namespace, name",
+        SAMPLE_TABLE_MUTATION_CASES,
+        ids=[
+            f"{mutation}-{namespace}-{name}"
+            for mutation, namespace, name in SAMPLE_TABLE_MUTATION_CASES
         ],
     )
-    def test_update_whole_project_with_id(self, namespace, name):
+    @pytest.mark.parametrize("project_type", ["raw", "peppy"])
+    def test_sample_table_mutation(self, mutation, namespace, name, project_type):
         """
-        General test for updating whole project with id (inserting one project without id)
+        Update project with changed sample table (samples with id are updated, without id are inserted)
         """
         with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
             prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
 
-            new_sample = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-
-            prj["_sample_dict"].append(new_sample.copy())
-            prj["_sample_dict"][0]["sample_name"] = "new_sample_name2"
-            del prj["_sample_dict"][1]
+            SAMPLE_TABLE_MUTATIONS[mutation](prj["_sample_dict"])
+            project = _project_for_update(prj, project_type)
+            if project_type == "peppy":
+                # peppy fills attributes, that are missing in new samples
+                sent_samples = project.to_dict(extended=True, orient="records")["_sample_dict"]
+            else:
+                sent_samples = prj["_sample_dict"]
+            expected_samples = [
+                {key: value for key, value in sample.items() if key != PEPHUB_SAMPLE_ID_KEY}
+                for sample in sent_samples
+            ]
 
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
+                update_dict={"project": project},
             )
 
-            del new_sample[PEPHUB_SAMPLE_ID_KEY]
-            peppy_prj["_sample_dict"].append(new_sample.copy())  # add sample without id
-            peppy_prj["_sample_dict"][0]["sample_name"] = "new_sample_name2"  # modify sample
-            del peppy_prj["_sample_dict"][1]  # delete sample
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
-
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
-        ],
-    )
-    def test_insert_new_row(self, namespace, name):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
-            prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            new_sample = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-
-            prj["_sample_dict"].append(new_sample.copy())
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            del new_sample[PEPHUB_SAMPLE_ID_KEY]
-            peppy_prj["_sample_dict"].append(new_sample.copy())  # add sample without id
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
+            assert (
+                agent.project.get(namespace=namespace, name=name, raw=True)["_sample_dict"]
+                == expected_samples
             )
 
     @pytest.mark.parametrize(
         "namespace, name",
         [
             ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
         ],
     )
-    def test_insert_new_multiple_rows(self, namespace, name):
+    def test_update_samples_new_sample_without_id_key(self, namespace, name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
             prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            new_sample1 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-            new_sample2 = {
-                "sample_name": "new_sample2",
-                "protocol": "new_protocol2",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-
-            prj["_sample_dict"].append(new_sample1.copy())
-            prj["_sample_dict"].append(new_sample2.copy())
+            samples = prj["_sample_dict"] + [dict(_NEW_SAMPLE)]
 
             agent.project.update(
                 namespace=namespace,
                 name=name,
                 tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
+                update_dict={"samples": samples},
             )
 
-            del new_sample1[PEPHUB_SAMPLE_ID_KEY]
-            del new_sample2[PEPHUB_SAMPLE_ID_KEY]
-            peppy_prj["_sample_dict"].append(new_sample1.copy())  # add sample without id
-            peppy_prj["_sample_dict"].append(new_sample2.copy())  # add sample without id
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
+            new_samples = agent.project.get(namespace=namespace, name=name, raw=True)[
+                "_sample_dict"
+            ]
+            assert len(new_samples) == len(samples)
+            assert new_samples[-1] == dict(_NEW_SAMPLE)
 
     @pytest.mark.parametrize(
         "namespace, name",
@@ -410,19 +469,8 @@ class TestUpdateProjectWithId:
         with PEPDBAgentContextManager(add_data=True) as agent:
             prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
 
-            new_sample1 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-            new_sample2 = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-
-            prj["_sample_dict"].append(new_sample1.copy())
-            prj["_sample_dict"].append(new_sample2.copy())
+            prj["_sample_dict"].append({**_NEW_SAMPLE, PEPHUB_SAMPLE_ID_KEY: None})
+            prj["_sample_dict"].append({**_NEW_SAMPLE, PEPHUB_SAMPLE_ID_KEY: None})
 
             with pytest.raises(IllegalStateException):
                 agent.project.update(
@@ -432,159 +480,21 @@ class TestUpdateProjectWithId:
                     update_dict={"project": peppy.Project.from_dict(prj)},
                 )
 
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace3", "subtable2"],
-            ["namespace1", "append"],
-        ],
-    )
-    def test_delete_multiple_rows(self, namespace, name):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
-            prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            del prj["_sample_dict"][1]
-            del prj["_sample_dict"][2]
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            del peppy_prj["_sample_dict"][1]  # delete sample
-            del peppy_prj["_sample_dict"][2]  # delete sample
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
-
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
-        ],
-    )
-    def test_modify_one_row(self, namespace, name):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
-            prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            prj["_sample_dict"][0]["sample_name"] = "new_sample_name2"
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            peppy_prj["_sample_dict"][0]["sample_name"] = "new_sample_name2"  # modify sample
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
-
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
-        ],
-    )
-    def test_modify_multiple_rows(self, namespace, name):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
-            prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            prj["_sample_dict"][0]["sample_name"] = "new_sample_name2"
-            prj["_sample_dict"][1]["sample_name"] = "new_sample_name3"
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            peppy_prj["_sample_dict"][0]["sample_name"] = "new_sample_name2"  # modify sample
-            peppy_prj["_sample_dict"][1]["sample_name"] = "new_sample_name3"  # modify sample
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
-
     @pytest.mark.parametrize(
         "namespace, name",
         [
             ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
         ],
     )
-    def test_add_new_first_sample(self, namespace, name):
+    def test_update_empty_samples_list(self, namespace, name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
-            prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            new_sample = {
-                "sample_name": "new_sample",
-                "protocol": "new_protocol",
-                PEPHUB_SAMPLE_ID_KEY: None,
-            }
-
-            prj["_sample_dict"].insert(0, new_sample.copy())
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            del new_sample[PEPHUB_SAMPLE_ID_KEY]
-            peppy_prj["_sample_dict"].insert(0, new_sample.copy())  # add sample without id
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
-
-    @pytest.mark.parametrize(
-        "namespace, name",
-        [
-            ["namespace1", "amendments1"],
-            ["namespace3", "subtable1"],
-        ],
-    )
-    def test_change_sample_order(self, namespace, name):
-        with PEPDBAgentContextManager(add_data=True) as agent:
-            peppy_prj = agent.project.get(namespace=namespace, name=name, raw=True)
-            prj = agent.project.get(namespace=namespace, name=name, raw=True, with_id=True)
-
-            sample1 = prj["_sample_dict"][0].copy()
-            sample2 = prj["_sample_dict"][1].copy()
-
-            prj["_sample_dict"][0] = sample2
-            prj["_sample_dict"][1] = sample1
-
-            agent.project.update(
-                namespace=namespace,
-                name=name,
-                tag="default",
-                update_dict={"project": peppy.Project.from_dict(prj)},
-            )
-
-            peppy_prj["_sample_dict"][0] = sample2
-            peppy_prj["_sample_dict"][1] = sample1
-
-            del peppy_prj["_sample_dict"][0][PEPHUB_SAMPLE_ID_KEY]
-            del peppy_prj["_sample_dict"][1][PEPHUB_SAMPLE_ID_KEY]
-
-            assert peppy.Project.from_dict(peppy_prj) == agent.project.get(
-                namespace=namespace, name=name, raw=False
-            )
+            with pytest.raises(SampleTableUpdateError):
+                agent.project.update(
+                    namespace=namespace,
+                    name=name,
+                    tag="default",
+                    update_dict={"samples": []},
+                )
 
     @pytest.mark.parametrize(
         "namespace, name",
@@ -605,7 +515,7 @@ class TestUpdateProjectWithId:
                     namespace=namespace,
                     name=name,
                     tag="default",
-                    update_dict={"project": peppy.Project.from_dict(prj)},
+                    update_dict={"project": prj},
                 )
 
     @pytest.mark.parametrize(
@@ -624,5 +534,5 @@ class TestUpdateProjectWithId:
                     namespace=namespace,
                     name=name,
                     tag="default",
-                    update_dict={"project": peppy.Project.from_dict(new_prj)},
+                    update_dict={"project": new_prj},
                 )
@@ -7,11 +7,31 @@ from pepdbagent.exceptions import (
     ViewNotFoundError,
 )
 
-from .utils import PEPDBAgentContextManager
+from .utils import PEPDBAgentContextManager, db_available
+
+VIEW_PARAMS = [
+    ["namespace1", "amendments1", "pig_0h", "view1"],
+]
+VIEW_CASE = pytest.mark.parametrize("namespace, name, sample_name, view_name", VIEW_PARAMS)
+
+
+def _create_view(agent, namespace: str, name: str, view_name: str, sample_list: list) -> None:
+    """
+    Create view of default tag project with provided samples
+    """
+    agent.view.create(
+        view_name,
+        {
+            "project_namespace": namespace,
+            "project_name": name,
+            "project_tag": "default",
+            "sample_list": sample_list,
+        },
+    )
 
 
 @pytest.mark.skipif(
-    not PEPDBAgentContextManager().db_setup(),
+    not db_available(),
     reason="DB is not setup",
 )
 class TestViews:
@@ -19,40 +39,22 @@ class TestViews:
     Test function within view class
     """
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name, view_name",
-        [
-            ["namespace1", "amendments1", "pig_0h", "view1"],
-        ],
-    )
+    @VIEW_CASE
     def test_create_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.view.create(
-                view_name,
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name, "pig_1h"],
-                },
-            )
+            _create_view(agent, namespace, name, view_name, [sample_name, "pig_1h"])
 
             project = agent.project.get(namespace, name, raw=False)
             view_project = agent.view.get(namespace, name, "default", view_name, raw=False)
             assert len(view_project.samples) == 2
             assert view_project != project
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name, view_name",
-        [
-            ["namespace1", "amendments1", "pig_0h", "view1"],
-        ],
-    )
+    @VIEW_CASE
     def test_create_view_with_incorrect_sample(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             with pytest.raises(SampleNotFoundError):
                 agent.view.create(
-                    "view1",
+                    view_name,
                     {
                         "project_namespace": "namespace1",
                         "project_name": "amendments1",
@@ -61,18 +63,13 @@ class TestViews:
                     },
                 )
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name, view_name",
-        [
-            ["namespace1", "amendments1", "pig_0h", "view1"],
-        ],
-    )
+    @VIEW_CASE
     def test_create_view_with_incorrect_sample_no_fail(
         self, namespace, name, sample_name, view_name
     ):
         with PEPDBAgentContextManager(add_data=True) as agent:
             agent.view.create(
-                "view1",
+                view_name,
                 {
                     "project_namespace": "namespace1",
                     "project_name": "amendments1",
@@ -86,119 +83,57 @@ class TestViews:
             assert len(view_project.samples) == 2
             assert view_project != project
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
-    def test_delete_view(self, namespace, name, sample_name):
+    @VIEW_CASE
+    def test_delete_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.view.create(
-                "view1",
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name, "pig_1h"],
-                },
+            _create_view(agent, namespace, name, view_name, [sample_name, "pig_1h"])
+            assert (
+                len(agent.view.get(namespace, name, "default", view_name, raw=False).samples) == 2
             )
-            assert len(agent.view.get(namespace, name, "default", "view1", raw=False).samples) == 2
-            agent.view.delete(namespace, name, "default", "view1")
+            agent.view.delete(namespace, name, "default", view_name)
             with pytest.raises(ViewNotFoundError):
-                agent.view.get(namespace, name, "default", "view1", raw=False)
+                agent.view.get(namespace, name, "default", view_name, raw=False)
             assert len(agent.project.get(namespace, name, raw=False).samples) == 4
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
-    def test_add_sample_to_view(self, namespace, name, sample_name):
+    @VIEW_CASE
+    def test_add_sample_to_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.view.create(
-                "view1",
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name],
-                },
+            _create_view(agent, namespace, name, view_name, [sample_name])
+            agent.view.add_sample(namespace, name, "default", view_name, "pig_1h")
+            assert (
+                len(agent.view.get(namespace, name, "default", view_name, raw=False).samples) == 2
             )
-            agent.view.add_sample(namespace, name, "default", "view1", "pig_1h")
-            assert len(agent.view.get(namespace, name, "default", "view1", raw=False).samples) == 2
-
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
-    def test_add_multiple_samples_to_view(self, namespace, name, sample_name):
+
+    @VIEW_CASE
+    def test_add_multiple_samples_to_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.view.create(
-                "view1",
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name],
-                },
+            _create_view(agent, namespace, name, view_name, [sample_name])
+            agent.view.add_sample(namespace, name, "default", view_name, ["pig_1h", "frog_0h"])
+            assert (
+                len(agent.view.get(namespace, name, "default", view_name, raw=False).samples) == 3
             )
-            agent.view.add_sample(namespace, name, "default", "view1", ["pig_1h", "frog_0h"])
-            assert len(agent.view.get(namespace, name, "default", "view1", raw=False).samples) == 3
-
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
-    def test_remove_sample_from_view(self, namespace, name, sample_name):
+
+    @VIEW_CASE
+    def test_remove_sample_from_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.view.create(
-                "view1",
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name, "pig_1h"],
-                },
+            _create_view(agent, namespace, name, view_name, [sample_name, "pig_1h"])
+            agent.view.remove_sample(namespace, name, "default", view_name, sample_name)
+            assert (
+                len(agent.view.get(namespace, name, "default", view_name, raw=False).samples) == 1
             )
-            agent.view.remove_sample(namespace, name, "default", "view1", sample_name)
-            assert len(agent.view.get(namespace, name, "default", "view1", raw=False).samples) == 1
             assert len(agent.project.get(namespace, name, raw=False).samples) == 4
 
             with pytest.raises(SampleNotInViewError):
-                agent.view.remove_sample(namespace, name, "default", "view1", sample_name)
+                agent.view.remove_sample(namespace, name, "default", view_name, sample_name)
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name",
-        [
-            ["namespace1", "amendments1", "pig_0h"],
-        ],
-    )
-    def test_add_existing_sample_in_view(self, namespace, name, sample_name):
+    @VIEW_CASE
+    def test_add_existing_sample_in_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
-            agent.view.create(
-                "view1",
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name, "pig_1h"],
-                },
-            )
+            _create_view(agent, namespace, name, view_name, [sample_name, "pig_1h"])
             with pytest.raises(SampleAlreadyInView):
-                agent.view.add_sample(namespace, name, "default", "view1", sample_name)
+                agent.view.add_sample(namespace, name, "default", view_name, sample_name)
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name, view_name",
-        [
-            ["namespace1", "amendments1", "pig_0h", "view1"],
-        ],
-    )
+    @VIEW_CASE
     def test_get_snap_view(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             snap_project = agent.view.get_snap_view(
@@ -210,22 +145,9 @@ class TestViews:
 
             assert len(snap_project.samples) == 2
 
-    @pytest.mark.parametrize(
-        "namespace, name, sample_name, view_name",
-        [
-            ["namespace1", "amendments1", "pig_0h", "view1"],
-        ],
-    )
+    @VIEW_CASE
     def test_get_view_list_from_project(self, namespace, name, sample_name, view_name):
         with PEPDBAgentContextManager(add_data=True) as agent:
             assert len(agent.view.get_views_annotation(namespace, name, "default").views) == 0
-            agent.view.create(
-                "view1",
-                {
-                    "project_namespace": namespace,
-                    "project_name": name,
-                    "project_tag": "default",
-                    "sample_list": [sample_name, "pig_1h"],
-                },
-            )
+            _create_view(agent, namespace, name, view_name, [sample_name, "pig_1h"])
             assert len(agent.view.get_views_annotation(namespace, name, "default").views) == 1